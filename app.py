@@ -1,259 +1,615 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for, flash
-from datetime import datetime, timedelta
+from flask import Flask, render_template, stream_template, request, jsonify, redirect, url_for, flash, get_flashed_messages, g
+from datetime import datetime, timedelta, timezone
 import sqlite3
 import json
+import csv
 import heapq
-import networkx as nx
+import io
+from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.date import DateTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 import plotly.graph_objs as go
-import plotly.utils
+import plotly.io as pio
 import os
 import atexit
+import queue
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import lru_cache
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('SESSION_SECRET', 'dev-secret-key')
 
-# Initialize scheduler
-scheduler = BackgroundScheduler()
-scheduler.start()
+# Encode chart payloads with orjson rather than Plotly's pure-Python encoder
+pio.json.config.default_engine = 'orjson'
+
+# Initialize scheduler; it is started by the first request rather than at
+# import, so processes that never serve requests (such as the debug
+# reloader's watcher) don't run a scheduler of their own
+scheduler = BackgroundScheduler(
+    executors={'default': ThreadPoolExecutor(max_workers=2)},
+    job_defaults={'coalesce': True, 'max_instances': 1, 'misfire_grace_time': 60}
+)
+_scheduler_lock = threading.Lock()
 
 # Shutdown scheduler when app exits
-atexit.register(lambda: scheduler.shutdown())
+atexit.register(lambda: scheduler.running and scheduler.shutdown())
+
+# Reminders sent ahead of each deadline, picked up by a once-a-minute sweep
+NOTIFICATION_INTERVALS = [
+    (timedelta(hours=24), "24 hours"),
+    (timedelta(hours=1), "1 hour"),
+    (timedelta(minutes=5), "5 minutes")
+]
+
+# Seconds rendered charts may be reused; tasks changed through this process
+# invalidate them at once, this bounds how long other processes' writes go unseen
+CHART_CACHE_TTL = 10
+
+# Most recently rendered chart JSON by page: (charts version, built at, charts)
+_chart_cache = {}
+
+# Seconds a polled unread-notification count may be reused
+UNREAD_COUNT_CACHE_TTL = 2
+
+# Chart pieces that never change, built once at startup
+_EMPTY_COMPLETION_JSON = pio.to_json(
+    go.Figure().update_layout(title="Daily Task Completion Trend (No Data)"), validate=False
+)
+_CALENDAR_LAYOUT = {
+    'title': "Task Calendar Timeline",
+    'xaxis_title': "Deadline",
+    'yaxis_title': "Tasks",
+    'height': 600
+}
+
+# Hot statements are kept as constants so each pooled connection's statement
+# cache sees the same SQL text on every call and skips re-parsing it
+SQL_INSERT_TASK = '''
+    INSERT INTO tasks (title, description, priority, deadline, estimated_duration, deadline_unix)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+SQL_INSERT_DEPENDENCY = 'INSERT INTO task_dependencies (task_id, depends_on_task_id) VALUES (?, ?)'
+SQL_PENDING_TASKS = '''
+    SELECT id, title, description, priority, deadline, status, estimated_duration
+    FROM tasks
+    WHERE status = 'pending'
+    ORDER BY priority DESC, deadline_unix IS NULL, deadline_unix
+'''
+SQL_TOP_PENDING = '''
+    SELECT id, title, priority, deadline
+    FROM tasks
+    WHERE status = 'pending'
+    ORDER BY priority DESC, deadline_unix IS NULL, deadline_unix
+    LIMIT ?
+'''
+SQL_DEPS = 'SELECT task_id, depends_on_task_id FROM task_dependencies'
+SQL_PENDING_DEADLINES = "SELECT id, title, deadline FROM tasks WHERE status = 'pending' AND deadline IS NOT NULL"
+SQL_DEPS_REVISION = 'SELECT MAX(id) FROM task_dependencies'
+SQL_TASK_DEPENDENCIES = '''
+    SELECT t.id, t.title, t.status
+    FROM tasks t
+    JOIN task_dependencies td ON t.id = td.depends_on_task_id
+    WHERE td.task_id = ?
+'''
+SQL_DEPENDENCIES_FOR_TASKS = '''
+    SELECT td.task_id, t.id, t.title, t.status
+    FROM task_dependencies td
+    JOIN tasks t ON t.id = td.depends_on_task_id
+    WHERE td.task_id IN (SELECT value FROM json_each(?))
+'''
+SQL_DEADLINES_DUE = '''
+    SELECT id, title, deadline FROM tasks
+    WHERE status = 'pending' AND deadline_unix > ? AND deadline_unix <= ? AND deadline_unix > ?
+'''
+SQL_CREATED_DUE = '''
+    SELECT id, title, deadline FROM tasks
+    WHERE status = 'pending' AND created_at > ? AND created_at <= ? AND deadline_unix > ?
+'''
+SQL_INSERT_NOTIFICATION = 'INSERT INTO notifications (task_id, message, read) VALUES (?, ?, ?)'
+SQL_INSERT_NOTIFICATION_ONCE = '''
+    INSERT INTO notifications (task_id, message, read)
+    SELECT :task_id, :message, 0
+    WHERE NOT EXISTS (SELECT 1 FROM notifications WHERE task_id = :task_id AND message = :message)
+'''
+SQL_COMPLETE_TASK = "UPDATE tasks SET status = 'completed', completed_at = CURRENT_TIMESTAMP WHERE id = ?"
+
+@lru_cache(maxsize=1024)
+def _parse_deadline(deadline):
+    """Parse a deadline string from the task form, or None when there is none"""
+    return datetime.fromisoformat(deadline) if deadline else None
+
+def _deadline_unix(deadline):
+    """Deadline string as Unix epoch seconds, or None when there is none"""
+    deadline_dt = _parse_deadline(deadline)
+    return int(deadline_dt.timestamp()) if deadline_dt is not None else None
+
+@lru_cache(maxsize=32)
+def _topological_order(task_ids, dependencies):
+    """Order task ids so every task comes after the tasks it depends on.
+    
+    ``task_ids`` is in priority order; whenever several tasks are ready the
+    one earliest in that order goes next. Only pairs where both tasks are in
+    ``task_ids`` count. Returns None on a cycle.
+    """
+    # Work on positions in task_ids, so comparing two ints compares priority,
+    # and adjacency can be a plain list indexed by position
+    position = {task_id: i for i, task_id in enumerate(task_ids)}
+    dependents = [[] for _ in task_ids]
+    in_degree = [0] * len(task_ids)
+    for task_id, depends_on in dependencies:
+        dependent = position.get(task_id)
+        prerequisite = position.get(depends_on)
+        if dependent is not None and prerequisite is not None:
+            dependents[prerequisite].append(dependent)
+            in_degree[dependent] += 1
+    
+    # Kahn's algorithm with a min-heap as the ready set; the initial list is
+    # ascending, so it is already a valid heap
+    ready = [i for i, degree in enumerate(in_degree) if degree == 0]
+    order = []
+    heappop, heappush = heapq.heappop, heapq.heappush
+    while ready:
+        i = heappop(ready)
+        order.append(task_ids[i])
+        for dependent in dependents[i]:
+            in_degree[dependent] -= 1
+            if in_degree[dependent] == 0:
+                heappush(ready, dependent)
+    
+    return tuple(order) if len(order) == len(task_ids) else None
+
+class ConnectionPool:
+    """Long-lived SQLite connections shared across requests.
+    
+    A single read-write connection serializes writes behind a lock, while a
+    queue of read-only connections lets selects run alongside it under WAL.
+    """
+    
+    # Attempts at BEGIN IMMEDIATE before giving up on a locked database
+    BUSY_RETRIES = 3
+    
+    # Seconds to wait for a read-only connection once all of them are in use
+    READER_TIMEOUT = 10
+    
+    def __init__(self, database, readers=None):
+        self.database = database
+        self._writer = self._connect(database)
+        self._writer.isolation_level = None  # transactions are managed explicitly
+        self._writer_lock = threading.Lock()
+        
+        # WAL is persistent in the database file, so it only needs setting once,
+        # and has to happen outside a transaction
+        self._writer.execute('PRAGMA journal_mode = WAL')
+        
+        # Read-only connections are opened on demand, up to the limit, and kept
+        # for the life of the process; the most recently used is handed out
+        # first so its page cache is warm
+        self._readers = queue.LifoQueue()
+        self._max_readers = readers or os.cpu_count() or 4
+        self._readers_opened = 0
+        self._readers_lock = threading.Lock()
+    
+    @staticmethod
+    def _connect(database, uri=False):
+        """Open a connection with per-connection pragmas applied"""
+        conn = sqlite3.connect(database, uri=uri, check_same_thread=False, cached_statements=256)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA synchronous = NORMAL')
+        conn.execute('PRAGMA temp_store = MEMORY')
+        conn.execute('PRAGMA cache_size = -20000')
+        conn.execute('PRAGMA busy_timeout = 5000')
+        return conn
+    
+    @contextmanager
+    def reader(self):
+        """Borrow a read-only connection for the duration of the block"""
+        conn = self.acquire_reader()
+        try:
+            yield conn
+        finally:
+            self.release_reader(conn)
+    
+    def release_reader(self, conn):
+        """Return a connection taken with acquire_reader to the pool"""
+        self._readers.put(conn)
+    
+    def acquire_reader(self):
+        """Take an idle read-only connection, opening one while under the limit"""
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        
+        with self._readers_lock:
+            can_open = self._readers_opened < self._max_readers
+            if can_open:
+                self._readers_opened += 1
+        
+        if can_open:
+            try:
+                return self._connect(f'file:{self.database}?mode=ro', uri=True)
+            except BaseException:
+                # Give the slot back, or failed opens would shrink the pool for good
+                with self._readers_lock:
+                    self._readers_opened -= 1
+                raise
+        
+        try:
+            return self._readers.get(timeout=self.READER_TIMEOUT)
+        except queue.Empty:
+            raise RuntimeError(
+                f'No read-only connection became free within {self.READER_TIMEOUT}s; '
+                'is one thread holding a reader while asking for another?'
+            ) from None
+    
+    @contextmanager
+    def writer(self):
+        """Hold the read-write connection inside a BEGIN IMMEDIATE transaction.
+        
+        Commits on success and rolls back on error.
+        """
+        with self._writer_lock:
+            self._begin_immediate()
+            try:
+                yield self._writer
+                self._writer.execute('COMMIT')
+            except BaseException:
+                # Also covers a failed COMMIT, which would otherwise leave the
+                # shared connection stuck inside the transaction
+                if self._writer.in_transaction:
+                    self._writer.execute('ROLLBACK')
+                raise
+    
+    def _begin_immediate(self):
+        """Take the write lock up front, retrying if another process holds it"""
+        for attempt in range(1, self.BUSY_RETRIES + 1):
+            try:
+                self._writer.execute('BEGIN IMMEDIATE')
+                return
+            except sqlite3.OperationalError as e:
+                if 'locked' not in str(e) or attempt == self.BUSY_RETRIES:
+                    raise
+                time.sleep(0.05 * attempt)
 
 class TaskScheduler:
+    # Notification messages, shared by the single and batched senders
+    _MSG_TEST = "🔔 TEST ALERT: Task '{title}' needs your attention! (Deadline: {deadline})"
+    _MSG_REMIND = "⏰ {interval} REMINDER: Task '{title}' deadline approaching! Due: {deadline}"
+    
     def __init__(self):
-        self.task_heap = []
-        self.dependency_graph = nx.DiGraph()
+        self.pool = ConnectionPool('scheduler.db')
+        self._dependencies_cache = (None, ())
+        self._last_sweep = datetime.now()
+        self._unread_cache = (0.0, 0)  # (monotonic time counted, unread count)
+        # Bumped inside pool.writer() when tasks are added or completed, so the
+        # write lock serializes it
+        self._charts_version = 0
         self.init_db()
+        
+        # One recurring job sends every due reminder, so adding a task never
+        # touches the scheduler
+        scheduler.add_job(
+            func=self.sweep_notifications,
+            trigger=IntervalTrigger(minutes=1),
+            id='notif_sweep',
+            replace_existing=True
+        )
     
     def init_db(self):
         """Initialize SQLite database with required tables"""
-        conn = sqlite3.connect('scheduler.db')
-        cursor = conn.cursor()
-        
-        # Tasks table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS tasks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                description TEXT,
-                priority INTEGER DEFAULT 1,
-                deadline TEXT,
-                status TEXT DEFAULT 'pending',
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                completed_at TEXT,
-                estimated_duration INTEGER DEFAULT 60
-            )
-        ''')
-        
-        # Task dependencies table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS task_dependencies (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                task_id INTEGER,
-                depends_on_task_id INTEGER,
-                FOREIGN KEY (task_id) REFERENCES tasks (id),
-                FOREIGN KEY (depends_on_task_id) REFERENCES tasks (id)
-            )
-        ''')
-        
-        # Notifications/alerts table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS notifications (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                task_id INTEGER,
-                message TEXT,
-                sent_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                read INTEGER DEFAULT 0,
-                FOREIGN KEY (task_id) REFERENCES tasks (id)
-            )
-        ''')
-        
-        # Add 'read' column to existing notifications table if it doesn't exist
-        cursor.execute("PRAGMA table_info(notifications)")
-        columns = [column[1] for column in cursor.fetchall()]
-        if 'read' not in columns:
-            cursor.execute('ALTER TABLE notifications ADD COLUMN read INTEGER DEFAULT 0')
-        
-        conn.commit()
-        conn.close()
+        with self.pool.writer() as conn:
+            cursor = conn.cursor()
+            
+            # Schema changes are applied once and recorded in user_version, so an
+            # up-to-date database only needs this one read at startup
+            cursor.execute('PRAGMA user_version')
+            version = cursor.fetchone()[0]
+            
+            if version < 1:
+                # Tasks table
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS tasks (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        title TEXT NOT NULL,
+                        description TEXT,
+                        priority INTEGER DEFAULT 1,
+                        deadline TEXT,
+                        status TEXT DEFAULT 'pending',
+                        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                        completed_at TEXT,
+                        estimated_duration INTEGER DEFAULT 60
+                    )
+                ''')
+                
+                # Task dependencies table
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS task_dependencies (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        task_id INTEGER,
+                        depends_on_task_id INTEGER,
+                        FOREIGN KEY (task_id) REFERENCES tasks (id),
+                        FOREIGN KEY (depends_on_task_id) REFERENCES tasks (id)
+                    )
+                ''')
+                
+                # Notifications/alerts table
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS notifications (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        task_id INTEGER,
+                        message TEXT,
+                        sent_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                        read INTEGER DEFAULT 0,
+                        FOREIGN KEY (task_id) REFERENCES tasks (id)
+                    )
+                ''')
+                
+                # Add 'read' column to notifications tables created before it existed
+                cursor.execute("PRAGMA table_info(notifications)")
+                columns = [column[1] for column in cursor.fetchall()]
+                if 'read' not in columns:
+                    cursor.execute('ALTER TABLE notifications ADD COLUMN read INTEGER DEFAULT 0')
+                
+                # Indexes for the pending-task, calendar, analytics, dependency and
+                # notification queries
+                cursor.execute('DROP INDEX IF EXISTS idx_tasks_status_priority')  # superseded below
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_tasks_status_priority_deadline ON tasks (status, priority DESC, deadline)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_tasks_deadline ON tasks (deadline) WHERE deadline IS NOT NULL')
+                # Covers the id, title and deadline read by the reminder sweep's range
+                # searches, so they never touch the table rows
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_tasks_status_deadline ON tasks (status, deadline, title)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_tasks_completed_at ON tasks (completed_at) WHERE completed_at IS NOT NULL')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_deps_task ON task_dependencies (task_id, depends_on_task_id)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_deps_depends_on ON task_dependencies (depends_on_task_id)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_notif_read ON notifications (read)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_notif_sent_at ON notifications (sent_at DESC)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_notif_task ON notifications (task_id)')
+                
+                cursor.execute('PRAGMA user_version = 1')
+            
+            if version < 2:
+                # Deadlines are also kept as epoch seconds, so ordering and the
+                # reminder sweep compare integers instead of parsed text
+                cursor.execute('ALTER TABLE tasks ADD COLUMN deadline_unix INTEGER')
+                cursor.execute("SELECT id, deadline FROM tasks WHERE deadline IS NOT NULL AND deadline != ''")
+                backfill = []
+                for task_id, deadline in cursor.fetchall():
+                    try:
+                        backfill.append((_deadline_unix(deadline), task_id))
+                    except ValueError:
+                        pass  # unparseable deadlines are left without one
+                cursor.executemany('UPDATE tasks SET deadline_unix = ? WHERE id = ?', backfill)
+                
+                cursor.execute('DROP INDEX IF EXISTS idx_tasks_status_priority_deadline')
+                cursor.execute('DROP INDEX IF EXISTS idx_tasks_status_deadline')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_tasks_status_priority_deadline_unix ON tasks (status, priority DESC, deadline_unix)')
+                # Covers everything the reminder sweep reads, so its range
+                # searches never touch the table rows
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_tasks_status_deadline_unix ON tasks (status, deadline_unix, title, deadline)')
+                
+                cursor.execute('PRAGMA user_version = 2')
+            
+            if version < 3:
+                # Tasks without a deadline sort after dated ones of the same priority
+                cursor.execute('DROP INDEX IF EXISTS idx_tasks_status_priority_deadline_unix')
+                cursor.execute('CREATE INDEX idx_tasks_status_priority_deadline_unix ON tasks (status, priority DESC, deadline_unix IS NULL, deadline_unix)')
+                
+                cursor.execute('PRAGMA user_version = 3')
     
     def add_task(self, title, description, priority, deadline, estimated_duration=60, dependencies=None):
-        """Add a new task to the database and priority heap"""
-        conn = sqlite3.connect('scheduler.db')
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO tasks (title, description, priority, deadline, estimated_duration)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (title, description, priority, deadline, estimated_duration))
-        
-        task_id = cursor.lastrowid
-        
-        # Add dependencies if provided
-        if dependencies:
-            for dep_task_id in dependencies:
-                cursor.execute('''
-                    INSERT INTO task_dependencies (task_id, depends_on_task_id)
-                    VALUES (?, ?)
-                ''', (task_id, dep_task_id))
-        
-        conn.commit()
-        conn.close()
-        
-        # Add to priority heap (negative priority for max heap behavior)
-        deadline_dt = datetime.fromisoformat(deadline) if deadline else datetime.max
-        heap_item = (-priority, deadline_dt, task_id, title)
-        heapq.heappush(self.task_heap, heap_item)
-        
-        # Schedule deadline notification
-        if deadline:
-            self.schedule_notification(task_id, deadline_dt)
+        """Add a new task to the database"""
+        with self.pool.writer() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(SQL_INSERT_TASK, (
+                title, description, priority, deadline, estimated_duration, _deadline_unix(deadline)
+            ))
+            
+            task_id = cursor.lastrowid
+            
+            # Add dependencies if provided, in the same transaction as the task
+            if dependencies:
+                cursor.executemany(
+                    SQL_INSERT_DEPENDENCY, [(task_id, dep_task_id) for dep_task_id in dependencies]
+                )
+            
+            self._charts_version += 1
         
         return task_id
     
     def get_tasks_ordered(self):
         """Get tasks ordered by priority and dependencies using topological sort"""
-        conn = sqlite3.connect('scheduler.db')
-        cursor = conn.cursor()
-        
-        # Get all pending tasks
-        cursor.execute('SELECT * FROM tasks WHERE status = "pending" ORDER BY priority DESC')
-        tasks = cursor.fetchall()
-        
-        # Get dependencies
-        cursor.execute('SELECT task_id, depends_on_task_id FROM task_dependencies')
-        dependencies = cursor.fetchall()
-        
-        conn.close()
-        
-        # Build dependency graph
-        self.dependency_graph.clear()
-        for task in tasks:
-            self.dependency_graph.add_node(task[0])  # task id
-        
-        for task_id, depends_on in dependencies:
-            if task_id in self.dependency_graph.nodes and depends_on in self.dependency_graph.nodes:
-                self.dependency_graph.add_edge(depends_on, task_id)
-        
-        # Get topologically sorted order
-        try:
-            sorted_order = list(nx.topological_sort(self.dependency_graph))
-            # Sort tasks according to dependency order, then by priority
-            task_dict = {task[0]: task for task in tasks}
-            ordered_tasks = []
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
             
-            for task_id in sorted_order:
-                if task_id in task_dict:
-                    ordered_tasks.append(task_dict[task_id])
+            # Get all pending tasks
+            cursor.execute(SQL_PENDING_TASKS)
+            tasks = cursor.fetchall()
             
-            # Add any remaining tasks not in dependency graph
-            for task in tasks:
-                if task not in ordered_tasks:
-                    ordered_tasks.append(task)
-                    
-            return ordered_tasks
-            
-        except nx.NetworkXError:
+            # Get dependencies
+            dependencies = self._get_dependencies(cursor)
+        
+        task_dict = {task[0]: task for task in tasks}
+        order = _topological_order(tuple(task_dict), dependencies)
+        if order is None:
             # Circular dependency detected, return by priority only
             return tasks
-    
-    def schedule_notification(self, task_id, deadline_dt):
-        """Schedule notifications for task deadline at multiple intervals"""
-        now = datetime.now()
         
-        # Schedule multiple notifications: 24 hours, 1 hour, and 5 minutes before deadline
-        notification_intervals = [
-            (timedelta(hours=24), "24 hours"),
-            (timedelta(hours=1), "1 hour"), 
-            (timedelta(minutes=5), "5 minutes")
-        ]
-        
-        # For immediate testing: add a notification that triggers in 30 seconds
-        immediate_notification_time = now + timedelta(seconds=30)
-        if immediate_notification_time < deadline_dt:
-            scheduler.add_job(
-                func=self.send_notification,
-                trigger=DateTrigger(run_date=immediate_notification_time),
-                args=[task_id, "IMMEDIATE_TEST"],
-                id=f'immediate_test_{task_id}',
-                replace_existing=True
-            )
-        
-        for interval, interval_name in notification_intervals:
-            notification_time = deadline_dt - interval
+        return [task_dict[task_id] for task_id in order]
+    
+    def top_k_pending(self, k=10):
+        """Get the k highest-priority pending tasks, earliest deadline first on ties and undated last"""
+        # Read straight off the (status, priority, deadline) ordering index, which
+        # stops after k rows instead of ordering every pending task
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(SQL_TOP_PENDING, (k,))
+            return cursor.fetchall()
+    
+    def _get_dependencies(self, cursor):
+        """All dependency pairs, re-read only when task_dependencies has changed"""
+        # Dependencies are only ever inserted, so the highest id is a revision
+        # number that also sees writes made by other processes
+        cursor.execute(SQL_DEPS_REVISION)
+        revision = cursor.fetchone()[0]
+        
+        cached_revision, dependencies = self._dependencies_cache
+        if revision != cached_revision:
+            cursor.execute(SQL_DEPS)
+            dependencies = tuple(tuple(row) for row in cursor.fetchall())
+            self._dependencies_cache = (revision, dependencies)
+        
+        return dependencies
+    
+    def bulk_add_tasks(self, tasks):
+        """Add many tasks in one transaction.
+        
+        ``tasks`` is a sequence of (title, description, priority, deadline,
+        estimated_duration) tuples. Returns the new task ids in input order.
+        """
+        tasks = list(tasks)
+        if not tasks:
+            return []
+        
+        with self.pool.writer() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(SQL_INSERT_TASK, [(*task, _deadline_unix(task[3])) for task in tasks])
             
-            if notification_time > now:
-                scheduler.add_job(
-                    func=self.send_notification,
-                    trigger=DateTrigger(run_date=notification_time),
-                    args=[task_id, interval_name],
-                    id=f'notification_{task_id}_{interval_name.replace(" ", "_")}',
-                    replace_existing=True
-                )
+            # AUTOINCREMENT ids are consecutive while we hold the write lock
+            cursor.execute('SELECT last_insert_rowid()')
+            last_id = cursor.fetchone()[0]
+            
+            self._charts_version += 1
+        
+        return list(range(last_id - len(tasks) + 1, last_id + 1))
+    
+    def complete_task(self, task_id):
+        """Mark a task as completed"""
+        with self.pool.writer() as conn:
+            cursor = conn.cursor()
+            cursor.execute(SQL_COMPLETE_TASK, (task_id,))
+            self._charts_version += 1
+    
+    def bulk_add_dependencies(self, dependencies):
+        """Add many (task_id, depends_on_task_id) pairs in one transaction"""
+        with self.pool.writer() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(SQL_INSERT_DEPENDENCY, dependencies)
     
     def send_immediate_test_notification(self, task_id):
         """Send immediate test notification for demonstration"""
-        conn = sqlite3.connect('scheduler.db')
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT title, deadline FROM tasks WHERE id = ?', (task_id,))
-        task = cursor.fetchone()
-        
-        if task:
-            message = f"🔔 TEST ALERT: Task '{task[0]}' needs your attention! (Deadline: {task[1]})"
-            cursor.execute(
-                'INSERT INTO notifications (task_id, message, read) VALUES (?, ?, ?)',
-                (task_id, message, 0)
-            )
+        with self.pool.writer() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT title, deadline FROM tasks WHERE id = ?', (task_id,))
+            task = cursor.fetchone()
+            
+            if task:
+                message = self._MSG_TEST.format(title=task['title'], deadline=task['deadline'])
+                cursor.execute(SQL_INSERT_NOTIFICATION, (task_id, message, 0))
         
-        conn.commit()
-        conn.close()
+        self._unread_cache = (0.0, 0)
     
-    def send_notification(self, task_id, interval_name="1 hour"):
-        """Send notification for upcoming deadline"""
-        conn = sqlite3.connect('scheduler.db')
-        cursor = conn.cursor()
+    def send_test_notifications_for_pending(self):
+        """Send a test notification for every pending task with a deadline.
         
-        cursor.execute('SELECT title, deadline FROM tasks WHERE id = ?', (task_id,))
-        task = cursor.fetchone()
+        Returns the number of notifications sent.
+        """
+        with self.pool.writer() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(SQL_PENDING_DEADLINES)
+            rows = [
+                (task_id, self._MSG_TEST.format(title=title, deadline=deadline), 0)
+                for task_id, title, deadline in cursor.fetchall()
+            ]
+            cursor.executemany(SQL_INSERT_NOTIFICATION, rows)
+        
+        self._unread_cache = (0.0, 0)
+        return len(rows)
+    
+    def sweep_notifications(self):
+        """Send every reminder that has fallen due since the previous sweep.
+        
+        Runs once a minute. Each window starts where the last one ended, so a
+        reminder is picked up by exactly one sweep; the insert also skips
+        messages already sent, in case another process swept the same window.
+        Deadlines that have already passed are never reminded about, however
+        long the window.
+        """
+        now = datetime.now()
+        since, self._last_sweep = self._last_sweep, now
         
-        if task:
-            message = f"⏰ {interval_name.upper()} REMINDER: Task '{task[0]}' deadline approaching! Due: {task[1]}"
-            cursor.execute(
-                'INSERT INTO notifications (task_id, message, read) VALUES (?, ?, ?)',
-                (task_id, message, 0)
-            )
+        # created_at is UTC text, so creation windows are compared as
+        # minute-precision strings
+        def utc_minute(dt):
+            return dt.astimezone(timezone.utc).strftime('%Y-%m-%d %H:%M')
         
-        conn.commit()
-        conn.close()
+        with self.pool.writer() as conn:
+            cursor = conn.cursor()
+            
+            due = []
+            for interval, interval_name in NOTIFICATION_INTERVALS:
+                cursor.execute(SQL_DEADLINES_DUE, (
+                    (since + interval).timestamp(), (now + interval).timestamp(), now.timestamp()
+                ))
+                due.extend((interval_name, task) for task in cursor.fetchall())
+            
+            # For immediate testing: tasks created since the last sweep get a
+            # reminder straight away
+            cursor.execute(SQL_CREATED_DUE, (utc_minute(since), utc_minute(now), now.timestamp()))
+            due.extend(("IMMEDIATE_TEST", task) for task in cursor.fetchall())
+            
+            cursor.executemany(SQL_INSERT_NOTIFICATION_ONCE, [
+                {
+                    'task_id': task_id,
+                    'message': self._MSG_REMIND.format(
+                        interval=interval_name.upper(), title=title, deadline=deadline
+                    )
+                }
+                for interval_name, (task_id, title, deadline) in due
+            ])
+        
+        if due:
+            self._unread_cache = (0.0, 0)
     
     def get_analytics(self):
         """Get productivity analytics data"""
-        conn = sqlite3.connect('scheduler.db')
-        cursor = conn.cursor()
-        
-        # Task completion stats
-        cursor.execute('SELECT status, COUNT(*) FROM tasks GROUP BY status')
-        status_counts = dict(cursor.fetchall())
-        
-        # Tasks by priority
-        cursor.execute('SELECT priority, COUNT(*) FROM tasks GROUP BY priority')
-        priority_counts = dict(cursor.fetchall())
-        
-        # Daily completion trend (last 7 days)
-        cursor.execute('''
-            SELECT DATE(completed_at) as date, COUNT(*) as completed
-            FROM tasks 
-            WHERE completed_at IS NOT NULL 
-            AND DATE(completed_at) >= DATE('now', '-7 days')
-            GROUP BY DATE(completed_at)
-            ORDER BY date
-        ''')
-        daily_completions = cursor.fetchall()
-        
-        conn.close()
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
+            
+            # Status counts, priority counts and the 7-day completion trend in
+            # one round-trip, each row tagged with the series it belongs to.
+            # completed_at is stored as UTC text, so the whole-day cutoff is
+            # compared directly and the completed_at index can be range-scanned
+            cutoff = (datetime.now(timezone.utc) - timedelta(days=7)).strftime('%Y-%m-%d')
+            cursor.execute('''
+                SELECT 'status', status, COUNT(*) FROM tasks GROUP BY status
+                UNION ALL
+                SELECT 'priority', priority, COUNT(*) FROM tasks GROUP BY priority
+                UNION ALL
+                SELECT 'daily', substr(completed_at, 1, 10) AS day, COUNT(*)
+                FROM tasks
+                WHERE completed_at IS NOT NULL
+                AND completed_at >= ?
+                GROUP BY day
+                ORDER BY 1, 2
+            ''', (cutoff,))
+            rows = cursor.fetchall()
+        
+        status_counts = {}
+        priority_counts = {}
+        daily_completions = []
+        for series, key, count in rows:
+            if series == 'status':
+                status_counts[key] = count
+            elif series == 'priority':
+                priority_counts[key] = count
+            else:
+                daily_completions.append((key, count))
         
         return {
             'status_counts': status_counts,
@@ -263,86 +619,146 @@ class TaskScheduler:
     
     def get_task_dependencies(self, task_id):
         """Get list of tasks that this task depends on"""
-        conn = sqlite3.connect('scheduler.db')
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT t.id, t.title, t.status
-            FROM tasks t
-            JOIN task_dependencies td ON t.id = td.depends_on_task_id
-            WHERE td.task_id = ?
-        ''', (task_id,))
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(SQL_TASK_DEPENDENCIES, (task_id,))
+            
+            dependencies = cursor.fetchall()
         
-        dependencies = cursor.fetchall()
-        conn.close()
+        return [dict(dep) for dep in dependencies]
+    
+    def get_dependencies_by_task(self, task_ids):
+        """Get the dependencies of several tasks at once, keyed by task id"""
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(SQL_DEPENDENCIES_FOR_TASKS, (json.dumps(list(task_ids)),))
+            rows = cursor.fetchall()
         
-        return [{'id': dep[0], 'title': dep[1], 'status': dep[2]} for dep in dependencies]
+        dependencies = defaultdict(list)
+        for task_id, dep_id, title, status in rows:
+            dependencies[task_id].append({'id': dep_id, 'title': title, 'status': status})
+        return dict(dependencies)
     
     def get_recent_notifications(self, limit=10):
         """Get recent notifications"""
-        conn = sqlite3.connect('scheduler.db')
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT n.id, n.message, n.sent_at, t.title, t.id as task_id, n.read
-            FROM notifications n
-            LEFT JOIN tasks t ON n.task_id = t.id
-            ORDER BY n.sent_at DESC
-            LIMIT ?
-        ''', (limit,))
-        
-        notifications = cursor.fetchall()
-        conn.close()
-        
-        return [{
-            'id': notif[0],
-            'message': notif[1],
-            'sent_at': notif[2],
-            'task_title': notif[3],
-            'task_id': notif[4],
-            'read': notif[5]
-        } for notif in notifications]
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT n.id, n.message, n.sent_at, t.title AS task_title, t.id AS task_id, n.read
+                FROM notifications n
+                LEFT JOIN tasks t ON n.task_id = t.id
+                ORDER BY n.sent_at DESC
+                LIMIT ?
+            ''', (limit,))
+            
+            notifications = cursor.fetchall()
+        
+        return [dict(notif) for notif in notifications]
     
     def mark_notification_read(self, notification_id):
         """Mark a notification as read"""
-        conn = sqlite3.connect('scheduler.db')
-        cursor = conn.cursor()
+        with self.pool.writer() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('UPDATE notifications SET read = 1 WHERE id = ?', (notification_id,))
         
-        cursor.execute('UPDATE notifications SET read = 1 WHERE id = ?', (notification_id,))
-        conn.commit()
-        conn.close()
+        self._unread_cache = (0.0, 0)
 
 # Initialize task scheduler
 task_scheduler = TaskScheduler()
 
+@app.before_request
+def start_scheduler():
+    """Start the background scheduler in the process serving requests"""
+    if not scheduler.running:
+        with _scheduler_lock:
+            if not scheduler.running:
+                # Sweep from now on, not from when the module was imported
+                task_scheduler._last_sweep = datetime.now()
+                scheduler.start()
+
+def get_db():
+    """Read-only pooled connection for the current request, checked out on first use.
+    
+    It goes back to the pool when the request ends. Writes still go through
+    ``task_scheduler.pool.writer()``, and TaskScheduler methods borrow a
+    reader of their own, so a route using both holds two.
+    """
+    if 'db' not in g:
+        g.db = task_scheduler.pool.acquire_reader()
+    return g.db
+
+@app.teardown_request
+def release_db(exc):
+    """Return the request's read-only connection, if it took one, to the pool"""
+    conn = g.pop('db', None)
+    if conn is not None:
+        task_scheduler.pool.release_reader(conn)
+
 @app.route('/')
 def index():
     """Main dashboard view"""
     tasks = task_scheduler.get_tasks_ordered()
     
-    # Convert to list of dicts for template
-    task_list = []
-    for task in tasks:
-        task_dict = {
-            'id': task[0],
-            'title': task[1],
-            'description': task[2],
-            'priority': task[3],
-            'deadline': task[4],
-            'status': task[5],
-            'created_at': task[6],
-            'completed_at': task[7],
-            'estimated_duration': task[8],
-            'dependencies': task_scheduler.get_task_dependencies(task[0])
-        }
-        task_list.append(task_dict)
+    # Dependencies for every task are fetched in one query and attached by id
+    dependencies = task_scheduler.get_dependencies_by_task(task['id'] for task in tasks)
+    tasks = [dict(task, dependencies=dependencies.get(task['id'], [])) for task in tasks]
+    
+    # Pop flashed messages before streaming starts so the session cookie is
+    # updated with the response headers; the template reads the cached copy
+    get_flashed_messages(with_categories=True)
     
-    return render_template('index.html', tasks=task_list)
+    # Stream the page so the first cards reach the browser while later ones render
+    return app.response_class(stream_template('index.html', tasks=tasks))
+
+def read_task_csv(file):
+    """Read task rows for bulk_add_tasks from an uploaded CSV file.
+    
+    The header row names the columns: title (required), description,
+    priority, deadline and estimated_duration.
+    """
+    tasks = []
+    for row in csv.DictReader(io.TextIOWrapper(file.stream, encoding='utf-8-sig')):
+        if not row.get('title'):
+            continue
+        deadline = row.get('deadline') or ''
+        _parse_deadline(deadline)  # reject bad deadlines before anything is inserted
+        
+        # Hold imported rows to the same rules as the task form
+        priority = int(row.get('priority') or 1)
+        if not 1 <= priority <= 5:
+            raise ValueError(f"priority for '{row['title']}' must be between 1 and 5")
+        estimated_duration = int(row.get('estimated_duration') or 60)
+        if estimated_duration < 1:
+            raise ValueError(f"estimated_duration for '{row['title']}' must be positive")
+        
+        tasks.append((
+            row['title'],
+            row.get('description') or '',
+            priority,
+            deadline,
+            estimated_duration
+        ))
+    return tasks
 
 @app.route('/add_task', methods=['GET', 'POST'])
 def add_task():
     """Add new task"""
     if request.method == 'POST':
+        csv_file = request.files.get('csv_file')
+        if csv_file:
+            try:
+                tasks = read_task_csv(csv_file)
+            except (ValueError, UnicodeDecodeError, csv.Error) as e:
+                flash(f'Could not import CSV: {e}', 'error')
+                return redirect(url_for('add_task'))
+            
+            task_ids = task_scheduler.bulk_add_tasks(tasks)
+            flash(f'Imported {len(task_ids)} tasks successfully!', 'success')
+            return redirect(url_for('index'))
+        
         title = request.form['title']
         description = request.form['description']
         priority = int(request.form['priority'])
@@ -358,40 +774,35 @@ def add_task():
         return redirect(url_for('index'))
     
     # Get available tasks for dependencies selection
-    conn = sqlite3.connect('scheduler.db')
-    cursor = conn.cursor()
-    cursor.execute('SELECT id, title, priority FROM tasks WHERE status != "completed" ORDER BY title')
+    cursor = get_db().cursor()
+    cursor.execute("SELECT id, title, priority FROM tasks WHERE status != 'completed' ORDER BY title")
     available_tasks = cursor.fetchall()
-    conn.close()
-    
-    # Convert to list of dicts for template
-    task_list = []
-    for task in available_tasks:
-        task_dict = {'id': task[0], 'title': task[1], 'priority': task[2]}
-        task_list.append(task_dict)
     
-    return render_template('add_task.html', available_tasks=task_list)
+    return render_template('add_task.html', available_tasks=available_tasks)
 
 @app.route('/complete_task/<int:task_id>', methods=['POST'])
 def complete_task(task_id):
     """Mark task as completed"""
-    conn = sqlite3.connect('scheduler.db')
-    cursor = conn.cursor()
-    
-    cursor.execute(
-        'UPDATE tasks SET status = "completed", completed_at = CURRENT_TIMESTAMP WHERE id = ?',
-        (task_id,)
-    )
-    
-    conn.commit()
-    conn.close()
-    
+    task_scheduler.complete_task(task_id)
     flash('Task marked as completed!', 'success')
     return redirect(url_for('index'))
 
+def _cached_charts(page, version, now):
+    """Chart JSON cached for a page, or None if tasks changed or it has expired"""
+    cached = _chart_cache.get(page)
+    if cached is not None and cached[0] == version and now - cached[1] < CHART_CACHE_TTL:
+        return cached[2]
+    return None
+
 @app.route('/analytics')
 def analytics():
     """Analytics dashboard"""
+    version = task_scheduler._charts_version
+    now = time.monotonic()
+    charts_json = _cached_charts('analytics', version, now)
+    if charts_json is not None:
+        return render_template('analytics.html', charts=charts_json)
+    
     analytics_data = task_scheduler.get_analytics()
     
     # Create Plotly charts
@@ -403,6 +814,7 @@ def analytics():
     )])
     
     # Daily completions line chart
+    completion_json = _EMPTY_COMPLETION_JSON
     if analytics_data['daily_completions']:
         dates, completions = zip(*analytics_data['daily_completions'])
         completion_fig = go.Figure(data=[go.Scatter(
@@ -412,9 +824,7 @@ def analytics():
             name='Completed Tasks'
         )])
         completion_fig.update_layout(title="Daily Task Completion Trend")
-    else:
-        completion_fig = go.Figure()
-        completion_fig.update_layout(title="Daily Task Completion Trend (No Data)")
+        completion_json = pio.to_json(completion_fig, validate=False)
     
     # Priority distribution bar chart
     priority_fig = go.Figure(data=[go.Bar(
@@ -426,59 +836,60 @@ def analytics():
     
     # Convert to JSON for template
     charts_json = {
-        'status_chart': json.dumps(status_fig, cls=plotly.utils.PlotlyJSONEncoder),
-        'completion_chart': json.dumps(completion_fig, cls=plotly.utils.PlotlyJSONEncoder),
-        'priority_chart': json.dumps(priority_fig, cls=plotly.utils.PlotlyJSONEncoder)
+        'status_chart': pio.to_json(status_fig, validate=False),
+        'completion_chart': completion_json,
+        'priority_chart': pio.to_json(priority_fig, validate=False)
     }
+    _chart_cache['analytics'] = (version, now, charts_json)
     
     return render_template('analytics.html', charts=charts_json)
 
 @app.route('/calendar')
 def calendar():
     """Calendar view of tasks"""
-    conn = sqlite3.connect('scheduler.db')
-    cursor = conn.cursor()
-    
-    cursor.execute('SELECT * FROM tasks WHERE deadline IS NOT NULL ORDER BY deadline')
+    version = task_scheduler._charts_version
+    now = time.monotonic()
+    calendar_json = _cached_charts('calendar', version, now)
+    if calendar_json is not None:
+        return render_template('calendar.html', calendar_chart=calendar_json)
+    
+    cursor = get_db().cursor()
+    cursor.execute('''
+        SELECT id, title, priority, deadline, status
+        FROM tasks
+        WHERE deadline IS NOT NULL
+        ORDER BY deadline
+    ''')
     tasks = cursor.fetchall()
-    conn.close()
     
-    # Create calendar timeline
-    events = []
+    # Create calendar timeline as a single WebGL trace with one point per task,
+    # which stays responsive in the browser with thousands of deadlines
+    deadlines = []
+    titles = []
+    colors = []
+    hover_texts = []
     for task in tasks:
-        events.append({
-            'x': task[4],  # deadline
-            'y': task[1],  # title
-            'text': f"Priority: {task[3]}<br>Status: {task[5]}",
-            'mode': 'markers',
-            'marker': {
-                'size': 10,
-                'color': 'red' if task[5] == 'pending' else 'green'
-            }
-        })
+        deadlines.append(task['deadline'])
+        titles.append(task['title'])
+        colors.append('red' if task['status'] == 'pending' else 'green')
+        hover_texts.append(f"Priority: {task['priority']}<br>Status: {task['status']}")
     
     calendar_fig = go.Figure()
-    
-    for event in events:
-        calendar_fig.add_trace(go.Scatter(
-            x=[event['x']],
-            y=[event['y']],
-            mode='markers+text',
-            text=[event['y']],
-            textposition='middle right',
-            marker=event['marker'],
-            showlegend=False,
-            hovertext=event['text']
-        ))
-    
-    calendar_fig.update_layout(
-        title="Task Calendar Timeline",
-        xaxis_title="Deadline",
-        yaxis_title="Tasks",
-        height=600
-    )
-    
-    calendar_json = json.dumps(calendar_fig, cls=plotly.utils.PlotlyJSONEncoder)
+    calendar_fig.add_trace(go.Scattergl(
+        x=deadlines,
+        y=titles,
+        mode='markers+text',
+        text=titles,
+        textposition='middle right',
+        marker={'size': 10, 'color': colors},
+        showlegend=False,
+        hovertext=hover_texts
+    ))
+    
+    calendar_fig.update_layout(**_CALENDAR_LAYOUT)
+    
+    calendar_json = pio.to_json(calendar_fig, validate=False)
+    _chart_cache['calendar'] = (version, now, calendar_json)
     
     return render_template('calendar.html', calendar_chart=calendar_json)
 
@@ -497,11 +908,15 @@ def mark_notification_read(notification_id):
 @app.route('/get_unread_count')
 def get_unread_count():
     """Get count of unread notifications for AJAX"""
-    conn = sqlite3.connect('scheduler.db')
-    cursor = conn.cursor()
-    cursor.execute('SELECT COUNT(*) FROM notifications WHERE read = 0')
-    count = cursor.fetchone()[0]
-    conn.close()
+    # Every open page polls this, so the count is reused for a moment; the
+    # scheduler clears it whenever it sends or reads notifications
+    now = time.monotonic()
+    counted_at, count = task_scheduler._unread_cache
+    if now - counted_at >= UNREAD_COUNT_CACHE_TTL:
+        cursor = get_db().cursor()
+        cursor.execute('SELECT COUNT(*) FROM notifications WHERE read = 0')
+        count = cursor.fetchone()[0]
+        task_scheduler._unread_cache = (now, count)
     return jsonify({'unread_count': count})
 
 @app.route('/test_notification/<int:task_id>', methods=['POST'])
@@ -514,16 +929,8 @@ def test_notification(task_id):
 @app.route('/trigger_all_notifications', methods=['POST'])
 def trigger_all_notifications():
     """Trigger test notifications for all pending tasks with deadlines"""
-    conn = sqlite3.connect('scheduler.db')
-    cursor = conn.cursor()
-    cursor.execute('SELECT id FROM tasks WHERE status = "pending" AND deadline IS NOT NULL')
-    task_ids = [row[0] for row in cursor.fetchall()]
-    conn.close()
-    
-    for task_id in task_ids:
-        task_scheduler.send_immediate_test_notification(task_id)
-    
-    flash(f'Test notifications sent for {len(task_ids)} tasks!', 'success')
+    sent = task_scheduler.send_test_notifications_for_pending()
+    flash(f'Test notifications sent for {sent} tasks!', 'success')
     return redirect(url_for('notifications'))
 
 if __name__ == '__main__':